@@ -1,665 +1,923 @@
-# profile-generator.py
-# Topographic utilities for generating and visualizing elevation cross-sections
-# Supports arbitrary movement from a base point and cross-section generation perpendicular to movement direction
-
-import pygame
-import sys
-import csv
-import requests
-import time
-import math
-
-# Location presets (like C #define)
-LOCATION_FUJI = (35.3606, 138.7274)
-LOCATION_SOUTH_ALPS = (35.6762, 138.2371)
-LOCATION_HIMALAYAS = (27.9881, 86.9250)  # Mt. Everest
-LOCATION_ALPS = (45.8326, 6.8652)  # Mont Blanc
-
-# Sample elevation data (dummy: use DEM data in practice)
-elevation_data = []
-
-
-def load_elevation_csv(filename):
-    """
-    Load elevation data from CSV file
-    Expected format: one elevation per line (e.g., 100\n120\n130\n...)
-    or comma-separated values (e.g., 100,120,130,...)
-    """
-    data = []
-    with open(filename, encoding="utf-8") as f:
-        reader = csv.reader(f)
-        for row in reader:
-            for val in row:
-                try:
-                    data.append(float(val))
-                except ValueError:
-                    pass
-    return data
-
-
-# Pygame elevation profile display test function
-def show_elevation_profile(data, length_km=100.0):
-    # Correct negative elevations to 0 (sea level)
-    # Interpolate missing values (None) linearly
-    def interpolate_missing(data):
-        new_data = data[:]
-        n = len(data)
-        for i, v in enumerate(new_data):
-            if v is None:
-                # Find valid values before and after
-                left = i - 1
-                while left >= 0 and new_data[left] is None:
-                    left -= 1
-                right = i + 1
-                while right < n and new_data[right] is None:
-                    right += 1
-                if left >= 0 and right < n:
-                    # Linear interpolation
-                    new_data[i] = new_data[left] + (
-                        new_data[right] - new_data[left]
-                    ) * (i - left) / (right - left)
-                elif left >= 0:
-                    new_data[i] = new_data[left]
-                elif right < n:
-                    new_data[i] = new_data[right]
-                else:
-                    new_data[i] = 0
-        return new_data
-
-    data = interpolate_missing(data)
-    data = [max(0, elev) for elev in data]
-
-    # Apply moving average smoothing (specify window width as parameter)
-    def smooth_elevation(data, window=5):
-        if window <= 1:
-            return data[:]
-        smoothed = []
-        half = window // 2
-        for i in range(len(data)):
-            left = max(0, i - half)
-            right = min(len(data), i + half + 1)
-            smoothed.append(sum(data[left:right]) / (right - left))
-        return smoothed
-
-    # Apply smoothing with window size 3
-    data = smooth_elevation(data, window=3)
-    # Display with 1:1 ratio: horizontal axis = distance, vertical axis = elevation
-    max_distance = length_km * 1000  # m
-    max_elev = max(data)
-    margin = 40
-    min_elev = 0  # Sea level baseline
-    elev_range = max_elev - min_elev + 1
-
-    # Fixed 1280px width, calculate height for 1:1 ratio
-    FIXED_WIDTH = 1280
-    inner_width = FIXED_WIDTH - 2 * margin
-    max_distance_km = max_distance / 1000
-    elev_range_km = elev_range / 1000
-    scale = inner_width / max_distance_km
-    plot_height = int(elev_range_km * scale)
-    HEIGHT = plot_height + 2 * margin
-    WIDTH = FIXED_WIDTH
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Elevation Profile (1:1 scale)")
-    font = pygame.font.SysFont(None, 18)
-    screen.fill((240, 240, 255))
-    # Axes
-    pygame.draw.line(
-        screen,
-        (0, 0, 0),
-        (margin, HEIGHT - margin),
-        (WIDTH - margin, HEIGHT - margin),
-        2,
-    )
-    pygame.draw.line(screen, (0, 0, 0), (margin, margin), (margin, HEIGHT - margin), 2)
-    # Vertical axis ticks
-    n_vticks = 5
-    for i in range(n_vticks + 1):
-        elev_km = elev_range_km * i / n_vticks
-        y = HEIGHT - margin - elev_km * scale
-        label_val = min_elev / 1000 + elev_km
-        pygame.draw.line(screen, (0, 0, 0), (margin - 6, y), (margin, y), 2)
-        label = font.render(f"{label_val:.1f}", True, (0, 0, 0))
-        screen.blit(label, (margin - 40, y - 8))
-
-    # Horizontal axis ticks
-    n_ticks = 10
-    for i in range(n_ticks + 1):
-        dist_km = max_distance_km * i / n_ticks
-        x = margin + dist_km * scale
-        pygame.draw.line(
-            screen, (0, 0, 0), (x, HEIGHT - margin), (x, HEIGHT - margin + 6), 2
-        )
-        label = font.render(f"{dist_km:.1f}", True, (0, 0, 0))
-        screen.blit(label, (x - 16, HEIGHT - margin + 8))
-    # Elevation profile
-    points = []
-    for i, elev in enumerate(data):
-        dist_km = max_distance_km * i / (len(data) - 1)
-        x = margin + dist_km * scale
-        y = HEIGHT - margin - ((elev - min_elev) / 1000) * scale
-        points.append((x, y))
-    if len(points) > 1:
-        pygame.draw.aalines(screen, (60, 120, 60), False, points)
-    pygame.display.flip()
-
-    # Event loop
-    clock = pygame.time.Clock()
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        clock.tick(30)
-    pygame.quit()
-    sys.exit()
-
-
-def fetch_elevation_open_elevation(points, sleep_sec=1.0):
-    """
-    Fetch elevation data from Open-Elevation API for a list of coordinates
-    Args:
-        points: List of (lat, lon) tuples
-        sleep_sec: Sleep duration between API calls to avoid rate limiting
-    Returns:
-        List of elevation values in meters
-    """
-    url = "https://api.open-elevation.com/api/v1/lookup"
-    locations = [{"latitude": lat, "longitude": lon} for lat, lon in points]
-    # API rate limiting: process 100 points at a time
-    elevations = []
-    for i in range(0, len(locations), 100):
-        chunk = locations[i : i + 100]
-        resp = requests.post(url, json={"locations": chunk})
-        if resp.status_code == 200:
-            data = resp.json()
-            elevations.extend([r["elevation"] for r in data["results"]])
-        else:
-            print("API error", resp.status_code, resp.text)
-            elevations.extend([None] * len(chunk))
-        time.sleep(sleep_sec)  # API rate limiting
-    return elevations
-
-
-def generate_line_points(lat1, lon1, lat2, lon2, n):
-    """
-    Generate n equally spaced points along a line from point A to point B
-    Args:
-        lat1, lon1: Starting point coordinates
-        lat2, lon2: Ending point coordinates
-        n: Number of points to generate
-    Returns:
-        List of (lat, lon) tuples
-    """
-    return [
-        (lat1 + (lat2 - lat1) * i / (n - 1), lon1 + (lon2 - lon1) * i / (n - 1))
-        for i in range(n)
-    ]
-
-
-def generate_cross_section_points(
-    center_lat, center_lon, move_bearing_deg, length_km, n
-):
-    """
-    Generate coordinates for a cross-section perpendicular to the movement direction
-    Args:
-        center_lat, center_lon: Center point of the cross-section
-        move_bearing_deg: Direction of movement (degrees from north)
-        length_km: Length of the cross-section (km)
-        n: Number of points to generate along the cross-section
-    Returns:
-        List of (lat, lon) tuples representing the cross-section
-    """
-    R = 6371.0  # Earth radius in km
-    half = length_km / 2
-
-    def dest_point(lat, lon, bearing_deg, dist_km):
-        lat1 = math.radians(lat)
-        lon1 = math.radians(lon)
-        bearing = math.radians(bearing_deg)
-        d_div_r = dist_km / R
-        lat2 = math.asin(
-            math.sin(lat1) * math.cos(d_div_r)
-            + math.cos(lat1) * math.sin(d_div_r) * math.cos(bearing)
-        )
-        lon2 = lon1 + math.atan2(
-            math.sin(bearing) * math.sin(d_div_r) * math.cos(lat1),
-            math.cos(d_div_r) - math.sin(lat1) * math.sin(lat2),
-        )
-        return math.degrees(lat2), math.degrees(lon2)
-
-    # Calculate left and right endpoints as seen from the movement direction
-    left_lat, left_lon = dest_point(center_lat, center_lon, move_bearing_deg - 90, half)
-    right_lat, right_lon = dest_point(
-        center_lat, center_lon, move_bearing_deg + 90, half
-    )
-
-    return generate_line_points(left_lat, left_lon, right_lat, right_lon, n)
-
-
-def dest_point(lat, lon, bearing_deg, dist_km):
-    """
-    Calculate destination point given distance and bearing from starting point
-    """
-    R = 6371.0  # Earth radius in km
-    lat1 = math.radians(lat)
-    lon1 = math.radians(lon)
-    bearing = math.radians(bearing_deg)
-    d_div_r = dist_km / R
-    lat2 = math.asin(
-        math.sin(lat1) * math.cos(d_div_r)
-        + math.cos(lat1) * math.sin(d_div_r) * math.cos(bearing)
-    )
-    lon2 = lon1 + math.atan2(
-        math.sin(bearing) * math.sin(d_div_r) * math.cos(lat1),
-        math.cos(d_div_r) - math.sin(lat1) * math.sin(lat2),
-    )
-    return math.degrees(lat2), math.degrees(lon2)
-
-
-def example_usage():
-    """
-    Example usage scenarios for elevation cross-section generation
-    """
-    # Example 1: Mt. Fuji cross-section facing north
-    print("Example 1: Mt. Fuji cross-section facing north")
-    base_lat, base_lon = 35.3606, 138.7274  # Mt. Fuji
-    cross_section_demo(
-        base_lat,
-        base_lon,
-        move_bearing=0,
-        move_distance=0,
-        length_km=20,
-        description="Mt. Fuji base - North facing",
-    )
-
-    # Example 2: 10km north of Mt. Fuji, cross-section facing east
-    print("\nExample 2: 10km north of Mt. Fuji, cross-section facing east")
-    cross_section_demo(
-        base_lat,
-        base_lon,
-        move_bearing=0,
-        move_distance=10,
-        length_km=15,
-        description="10km North of Mt. Fuji - East facing",
-    )
-
-    # Example 3: 5km northeast of Mt. Fuji, cross-section facing southeast
-    print("\nExample 3: 5km northeast of Mt. Fuji, cross-section facing southeast")
-    cross_section_demo(
-        base_lat,
-        base_lon,
-        move_bearing=45,
-        move_distance=5,
-        length_km=12,
-        description="5km NE of Mt. Fuji - SE facing",
-    )
-
-
-def cross_section_demo(
-    base_lat, base_lon, move_bearing, move_distance, length_km, description
-):
-    """
-    Demonstrate cross-section generation with given parameters
-    """
-    print(f"  Location: {description}")
-    print(f"  Base coordinates: ({base_lat:.4f}, {base_lon:.4f})")
-    print(f"  Movement: {move_distance}km at {move_bearing}° bearing")
-    print(f"  Cross-section: {length_km}km perpendicular to movement direction")
-
-    # Calculate center point
-    center_lat, center_lon = dest_point(base_lat, base_lon, move_bearing, move_distance)
-    print(f"  Center coordinates: ({center_lat:.4f}, {center_lon:.4f})")
-
-    # Generate cross-section points (sample for demonstration)
-    n_points = 21  # Fewer points for demo
-    points = generate_cross_section_points(
-        center_lat, center_lon, move_bearing, length_km, n_points
-    )
-
-    print(f"  Generated {len(points)} points along cross-section")
-    print(f"  Left endpoint: ({points[0][0]:.4f}, {points[0][1]:.4f})")
-    print(f"  Right endpoint: ({points[-1][0]:.4f}, {points[-1][1]:.4f})")
-
-
-def save_elevation_csv(data, filename, length_km=None, points=None):
-    """
-    Save elevation data to CSV file
-    Args:
-        data: List of elevation values
-        filename: Output filename
-        length_km: Total distance in km (optional, for distance calculation)
-        points: List of (lat, lon) coordinates (optional)
-    """
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        # Write header
-        if points and length_km:
-            writer.writerow(
-                ["Index", "Distance_km", "Latitude", "Longitude", "Elevation_m"]
-            )
-        elif length_km:
-            writer.writerow(["Index", "Distance_km", "Elevation_m"])
-        elif points:
-            writer.writerow(["Index", "Latitude", "Longitude", "Elevation_m"])
-        else:
-            writer.writerow(["Index", "Elevation_m"])
-
-        # Write data
-        for i, elev in enumerate(data):
-            row = [str(i)]
-
-            if length_km:
-                dist_km = length_km * i / (len(data) - 1) if len(data) > 1 else 0
-                row.append(f"{dist_km:.3f}")
-
-            if points and i < len(points):
-                lat, lon = points[i]
-                row.extend([f"{lat:.6f}", f"{lon:.6f}"])
-
-            row.append(f"{elev:.1f}" if elev is not None else "N/A")
-            writer.writerow(row)
-
-    print(f"Elevation data saved to: {filename}")
-
-
-def save_cross_section_summary(
-    base_lat,
-    base_lon,
-    move_bearing_deg,
-    move_distance_km,
-    length_km,
-    center_lat,
-    center_lon,
-    points,
-    filename,
-):
-    """
-    Save cross-section parameters and coordinates to CSV file
-    Args:
-        base_lat, base_lon: Base coordinates
-        move_bearing_deg: Movement direction
-        move_distance_km: Movement distance
-        length_km: Cross-section length
-        center_lat, center_lon: Center coordinates
-        points: List of cross-section coordinates
-        filename: Output filename
-    """
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        # Write metadata
-        writer.writerow(["# Cross-Section Parameters"])
-        writer.writerow(["Base_Latitude", base_lat])
-        writer.writerow(["Base_Longitude", base_lon])
-        writer.writerow(["Movement_Bearing_deg", move_bearing_deg])
-        writer.writerow(["Movement_Distance_km", move_distance_km])
-        writer.writerow(["Cross_Section_Length_km", length_km])
-        writer.writerow(["Center_Latitude", center_lat])
-        writer.writerow(["Center_Longitude", center_lon])
-        writer.writerow([])  # Empty row
-
-        # Write coordinates
-        writer.writerow(["# Cross-Section Coordinates"])
-        writer.writerow(["Index", "Distance_from_left_km", "Latitude", "Longitude"])
-
-        for i, (lat, lon) in enumerate(points):
-            dist_from_left = length_km * i / (len(points) - 1) if len(points) > 1 else 0
-            writer.writerow(
-                [str(i), f"{dist_from_left:.3f}", f"{lat:.6f}", f"{lon:.6f}"]
-            )
-
-    print(f"Cross-section summary saved to: {filename}")
-
-
-def save_elevation_profile_image(data, length_km, filename):
-    """
-    Save elevation profile as image file (PNG)
-    Args:
-        data: List of elevation values
-        length_km: Total distance in km
-        filename: Output filename (should end with .png)
-    """
-    # This is a simplified version - would need additional libraries like matplotlib for better output
-    # For now, we'll save the data that could be used to recreate the visualization
-    import json
-
-    profile_data = {
-        "length_km": length_km,
-        "elevations": data,
-        "points_count": len(data),
-        "max_elevation": max(data) if data else 0,
-        "min_elevation": min(data) if data else 0,
-    }
-
-    # Save as JSON for now (could be extended to actual image with matplotlib)
-    json_filename = filename.replace(".png", ".json")
-    with open(json_filename, "w", encoding="utf-8") as f:
-        json.dump(profile_data, f, indent=2)
-
-    print(f"Elevation profile data saved to: {json_filename}")
-    print("Note: For actual PNG output, consider using matplotlib")
-
-
-def save_display_coordinates_csv(data, length_km, filename):
-    """
-    Save pygame display coordinates to CSV file
-    Args:
-        data: List of elevation values
-        length_km: Total distance in km
-        filename: Output filename
-    """
-    # Recalculate display coordinates (same logic as in show_elevation_profile)
-    max_distance = length_km * 1000  # m
-    max_elev = max(data) if data else 100
-    margin = 40
-    min_elev = 0  # Sea level baseline
-    elev_range = max_elev - min_elev + 1
-
-    # Fixed 1280px width, calculate height for 1:1 ratio
-    FIXED_WIDTH = 1280
-    inner_width = FIXED_WIDTH - 2 * margin
-    max_distance_km = max_distance / 1000
-    elev_range_km = elev_range / 1000
-    scale = inner_width / max_distance_km
-    plot_height = int(elev_range_km * scale)
-    HEIGHT = plot_height + 2 * margin
-
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        # Write display parameters
-        writer.writerow(["# Display Parameters"])
-        writer.writerow(["Screen_Width", FIXED_WIDTH])
-        writer.writerow(["Screen_Height", HEIGHT])
-        writer.writerow(["Margin", margin])
-        writer.writerow(["Scale_pixels_per_km", f"{scale:.3f}"])
-        writer.writerow(["Max_Elevation_m", max_elev])
-        writer.writerow(["Min_Elevation_m", min_elev])
-        writer.writerow([])  # Empty row
-
-        # Write coordinate headers
-        writer.writerow(["# Display Coordinates"])
-        writer.writerow(["Index", "Distance_km", "Elevation_m", "Screen_X", "Screen_Y"])
-
-        # Calculate and write display coordinates
-        for i, elev in enumerate(data):
-            dist_km = max_distance_km * i / (len(data) - 1) if len(data) > 1 else 0
-            screen_x = margin + dist_km * scale
-            screen_y = HEIGHT - margin - ((elev - min_elev) / 1000) * scale
-
-            writer.writerow(
-                [
-                    str(i),
-                    f"{dist_km:.3f}",
-                    f"{elev:.1f}" if elev is not None else "N/A",
-                    f"{screen_x:.1f}",
-                    f"{screen_y:.1f}",
-                ]
-            )
-
-    print(f"Display coordinates saved to: {filename}")
-
-
-if __name__ == "__main__":
-    print("topograph.py: Elevation cross-section generation test")
-
-    # Uncomment the line below to see usage examples
-    # example_usage()
-
-    try:
-        # Clean up existing cross-section files before generating new ones
-        import glob
-        import os
-
-        patterns = [
-            "cross_section_*km_elevation.csv",
-            "cross_section_*km_coordinates.csv",
-            "cross_section_*km_profile.json",
-            "cross_section_*km_display_coords.csv",
-        ]
-        for pattern in patterns:
-            existing_files = glob.glob(pattern)
-            for file in existing_files:
-                os.remove(file)
-                print(f"Removed existing file: {file}")
-
-        # Base point and parameters - MODIFY THESE VALUES AS NEEDED
-        # base_lat, base_lon = 35.3606, 138.7274  # Mt. Fuji coordinates
-        # base_lat, base_lon = 35.6762, 138.2371  # South Alps (Kitadake area)
-        base_lat, base_lon = LOCATION_FUJI
-        move_bearing_deg = (
-            -90  # Movement direction (degrees from north): 0=N, 90=E, 180=S, 270=W
-        )
-        length_km = 20  # Cross-section length (km) perpendicular to movement direction
-        n_points = int(length_km * 1000 / 200) + 1  # ~200m spacing between points
-
-        # Multiple distances to generate (negative values move in opposite direction)
-        distances = [-20, -10, 0]  # km
-        save_to_files = True
-
-        for move_distance_km in distances:
-            print(f"\n=== Processing distance: {move_distance_km}km ===")
-
-            # Calculate center point after movement
-            center_lat, center_lon = dest_point(
-                base_lat, base_lon, move_bearing_deg, move_distance_km
-            )
-
-            # Generate cross-section coordinate list
-            points = generate_cross_section_points(
-                center_lat, center_lon, move_bearing_deg, length_km, n_points
-            )
-
-            # File prefix with distance
-            output_prefix = f"cross_section_{move_distance_km}km"
-
-            # Save cross-section summary if enabled
-            if save_to_files:
-                save_cross_section_summary(
-                    base_lat,
-                    base_lon,
-                    move_bearing_deg,
-                    move_distance_km,
-                    length_km,
-                    center_lat,
-                    center_lon,
-                    points,
-                    f"{output_prefix}_coordinates.csv",
-                )
-
-            # Fetch elevation data
-            print(f"Fetching elevation data for {len(points)} points...")
-            elevation_data = fetch_elevation_open_elevation(points)
-            if not elevation_data or any(e is None for e in elevation_data):
-                raise Exception("Failed to fetch elevation data")
-
-            # Save elevation data if enabled
-            if save_to_files:
-                save_elevation_csv(
-                    elevation_data,
-                    f"{output_prefix}_elevation.csv",
-                    length_km=length_km,
-                    points=points,
-                )
-                save_elevation_profile_image(
-                    elevation_data, length_km, f"{output_prefix}_profile.png"
-                )
-                save_display_coordinates_csv(
-                    elevation_data, length_km, f"{output_prefix}_display_coords.csv"
-                )
-
-        print("\n=== All distances processed! ===")
-        print("Files generated for distances:", distances)
-    except requests.exceptions.RequestException as e:
-        print(f"Network error while fetching elevation data: {e}")
-        print("Using dummy data for display")
-        dummy_data = [
-            100,
-            120,
-            130,
-            140,
-            160,
-            180,
-            170,
-            150,
-            140,
-            130,
-            120,
-            110,
-            100,
-            90,
-            80,
-            85,
-            90,
-            100,
-            120,
-            140,
-        ]
-
-        # Save dummy data if file output is enabled
-        output_prefix = "cross_section_dummy"
-        save_elevation_csv(dummy_data, f"{output_prefix}_elevation.csv", length_km=20)
-        save_elevation_profile_image(dummy_data, 20, f"{output_prefix}_profile.png")
-        save_display_coordinates_csv(
-            dummy_data, 20, f"{output_prefix}_display_coords.csv"
-        )
-
-        show_elevation_profile(dummy_data, length_km=20)
-    except Exception as e:
-        print(f"Error occurred: {e}")
-        print("Using dummy data for display")
-        dummy_data = [
-            100,
-            120,
-            130,
-            140,
-            160,
-            180,
-            170,
-            150,
-            140,
-            130,
-            120,
-            110,
-            100,
-            90,
-            80,
-            85,
-            90,
-            100,
-            120,
-            140,
-        ]
-
-        # Save dummy data if file output is enabled
-        output_prefix = "cross_section_dummy"
-        save_elevation_csv(dummy_data, f"{output_prefix}_elevation.csv", length_km=20)
-        save_elevation_profile_image(dummy_data, 20, f"{output_prefix}_profile.png")
-        save_display_coordinates_csv(
-            dummy_data, 20, f"{output_prefix}_display_coords.csv"
-        )
-
-        show_elevation_profile(dummy_data, length_km=20)
+# profile-generator.py
+# Topographic utilities for generating and visualizing elevation cross-sections
+# Supports arbitrary movement from a base point and cross-section generation perpendicular to movement direction
+
+import pygame
+import sys
+import csv
+import io
+import shelve
+import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional: kernels run as plain NumPy code
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Location presets (like C #define)
+LOCATION_FUJI = (35.3606, 138.7274)
+LOCATION_SOUTH_ALPS = (35.6762, 138.2371)
+LOCATION_HIMALAYAS = (27.9881, 86.9250)  # Mt. Everest
+LOCATION_ALPS = (45.8326, 6.8652)  # Mont Blanc
+
+EARTH_RADIUS_KM = 6371.0  # Mean Earth radius used by all spherical calculations
+
+# Sample elevation data (dummy: use DEM data in practice)
+elevation_data = []
+
+
+def load_elevation_csv(filename):
+    """
+    Load elevation data from CSV file
+    Expected format: one elevation per line (e.g., 100\n120\n130\n...)
+    or comma-separated values (e.g., 100,120,130,...)
+    """
+    data = []
+    with open(filename, encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            for val in row:
+                try:
+                    data.append(float(val))
+                except ValueError:
+                    pass
+    return data
+
+
+def compute_elevation_stats(data):
+    """
+    Compute summary statistics of an elevation profile once, to be shared by
+    the save/display functions instead of rescanning the data in each
+    Args:
+        data: Elevation values in meters (None entries are ignored)
+    Returns:
+        Dict with "n" (number of values), "max" and "min" (None when empty)
+    """
+    arr = np.asarray(data, dtype=np.float64)
+    if not arr.size:
+        return {"n": 0, "max": None, "min": None}
+    return {"n": arr.size, "max": float(np.nanmax(arr)), "min": float(np.nanmin(arr))}
+
+
+def compute_display_layout(
+    data, length_km, margin=40, width=1280, min_elev=0, stats=None
+):
+    """
+    Compute the 1:1 scale pygame display layout and screen coordinates of a profile
+    Horizontal axis = distance, vertical axis = elevation, fixed window width
+    Args:
+        data: Elevation values in meters (list or array)
+        length_km: Total distance in km
+        margin: Margin around the plot area in pixels
+        width: Fixed window width in pixels
+        min_elev: Baseline elevation in meters
+        stats: Precomputed compute_elevation_stats() result (optional)
+    Returns:
+        Dict with window size, scale (pixels per km), elevation range and
+        per-point dist_km / screen_x / screen_y arrays
+    """
+    elev = np.asarray(data, dtype=np.float64)
+    if stats is None:
+        stats = compute_elevation_stats(elev)
+    max_elev = stats["max"] if stats["n"] else 100
+    elev_range_km = (max_elev - min_elev + 1) / 1000
+
+    # Fixed width, calculate height for 1:1 ratio
+    inner_width = width - 2 * margin
+    scale = inner_width / length_km
+    plot_height = int(elev_range_km * scale)
+    height = plot_height + 2 * margin
+
+    dist_km = np.linspace(0.0, length_km, len(elev))
+    return {
+        "width": width,
+        "height": height,
+        "margin": margin,
+        "scale": scale,
+        "max_elev": max_elev,
+        "min_elev": min_elev,
+        "elev_range_km": elev_range_km,
+        "dist_km": dist_km,
+        "screen_x": margin + dist_km * scale,
+        "screen_y": height - margin - ((elev - min_elev) / 1000) * scale,
+    }
+
+
+def to_screen_points(screen_x, screen_y, max_points=None):
+    """
+    Pack screen coordinates into an (N, 2) int16 array for pygame draw calls
+    Args:
+        screen_x, screen_y: Screen coordinate arrays
+        max_points: Decimate to at most about this many vertices (optional)
+    Returns:
+        (N, 2) int16 array of (x, y) rows
+    """
+    n = len(screen_x)
+    pts = np.empty((n, 2), dtype=np.int16)
+    pts[:, 0] = np.clip(screen_x, -32000, 32000)
+    pts[:, 1] = np.clip(screen_y, -32000, 32000)
+    if max_points and n > max_points:
+        # More vertices than pixels is invisible work: keep every stride-th
+        # point plus the last one
+        stride = -(-n // max_points)
+        idx = np.arange(0, n, stride)
+        if idx[-1] != n - 1:
+            idx = np.append(idx, n - 1)
+        pts = pts[idx]
+    return pts
+
+
+def to_envelope_polygon(screen_x, screen_y, cols):
+    """
+    Reduce a dense profile to a per-pixel-column min/max band
+    Args:
+        screen_x, screen_y: Screen coordinate arrays (more than cols points)
+        cols: Number of columns (plot width in pixels)
+    Returns:
+        (2 * cols, 2) int16 polygon: upper edge left to right, then lower
+        edge right to left
+    """
+    starts = np.linspace(0, len(screen_x), cols, endpoint=False).astype(np.intp)
+    x = screen_x[starts]
+    upper = to_screen_points(x, np.minimum.reduceat(screen_y, starts))
+    lower = to_screen_points(x, np.maximum.reduceat(screen_y, starts))
+    return np.concatenate([upper, lower[::-1]])
+
+
+# Pygame elevation profile display test function
+def show_elevation_profile(data, length_km=100.0):
+    # Interpolate missing values (None) linearly, correct negative elevations
+    # to 0 (sea level) and apply moving average smoothing in one NumPy pass
+    def prepare_elevation(data, window=5):
+        a = np.array(data, dtype=np.float64)  # Copy, None becomes NaN
+        n = len(a)
+        idx = np.arange(n)
+        missing = np.isnan(a)
+        # Fast path: complete profiles (the normal case) skip interpolation
+        if missing.all():
+            a = np.zeros(n)
+        elif missing.any():
+            # Interior gaps are interpolated, leading/trailing gaps take the
+            # nearest valid value
+            valid = ~missing
+            a = np.interp(idx, idx[valid], a[valid])
+        np.maximum(a, 0.0, out=a)
+        if window <= 1:
+            return a
+        # Moving average via cumulative sums: O(N) regardless of window width,
+        # windows are truncated at both ends
+        half = window // 2
+        c = np.concatenate(([0.0], np.cumsum(a)))
+        left = np.maximum(0, idx - half)
+        right = np.minimum(n, idx + half + 1)
+        return (c[right] - c[left]) / (right - left)
+
+    # Apply smoothing with window size 3
+    data = prepare_elevation(data, window=3)
+    # Display with 1:1 ratio: horizontal axis = distance, vertical axis = elevation
+    layout = compute_display_layout(data, length_km)
+    margin = layout["margin"]
+    min_elev = layout["min_elev"]
+    max_distance_km = length_km
+    elev_range_km = layout["elev_range_km"]
+    scale = layout["scale"]
+    HEIGHT = layout["height"]
+    WIDTH = layout["width"]
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Elevation Profile (1:1 scale)")
+    font = pygame.font.SysFont(None, 18)
+
+    # Render each distinct tick label only once
+    label_cache = {}
+
+    def render_label(text):
+        if text not in label_cache:
+            label_cache[text] = font.render(text, True, (0, 0, 0)).convert_alpha()
+        return label_cache[text]
+
+    # Axes, ticks and labels never change: pre-render them into a static surface
+    def build_background():
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill((240, 240, 255))
+        # Axes
+        pygame.draw.line(
+            background,
+            (0, 0, 0),
+            (margin, HEIGHT - margin),
+            (WIDTH - margin, HEIGHT - margin),
+            2,
+        )
+        pygame.draw.line(
+            background, (0, 0, 0), (margin, margin), (margin, HEIGHT - margin), 2
+        )
+        label_blits = []
+        # Vertical axis ticks
+        n_vticks = 5
+        for i in range(n_vticks + 1):
+            elev_km = elev_range_km * i / n_vticks
+            y = HEIGHT - margin - elev_km * scale
+            label_val = min_elev / 1000 + elev_km
+            pygame.draw.line(background, (0, 0, 0), (margin - 6, y), (margin, y), 2)
+            label_blits.append((render_label(f"{label_val:.1f}"), (margin - 40, y - 8)))
+
+        # Horizontal axis ticks
+        n_ticks = 10
+        for i in range(n_ticks + 1):
+            dist_km = max_distance_km * i / n_ticks
+            x = margin + dist_km * scale
+            pygame.draw.line(
+                background,
+                (0, 0, 0),
+                (x, HEIGHT - margin),
+                (x, HEIGHT - margin + 6),
+                2,
+            )
+            label_blits.append(
+                (render_label(f"{dist_km:.1f}"), (x - 16, HEIGHT - margin + 8))
+            )
+        # All tick labels in one batched call
+        background.blits(label_blits, doreturn=False)
+        return background
+
+    background = build_background()
+
+    # Elevation profile
+    plot_width = WIDTH - 2 * margin
+    if len(data) > 2 * plot_width:
+        # Dense profile: draw the per-column min/max band instead of every sample
+        band = to_envelope_polygon(
+            layout["screen_x"], layout["screen_y"], plot_width
+        )
+        points = None
+    else:
+        band = None
+        points = to_screen_points(
+            layout["screen_x"], layout["screen_y"], max_points=plot_width
+        )
+
+    def draw():
+        screen.blit(background, (0, 0))
+        if band is not None:
+            pygame.draw.polygon(screen, (60, 120, 60), band)
+        elif len(points) > 1:
+            pygame.draw.aalines(screen, (60, 120, 60), False, points)
+        pygame.display.flip()
+
+    draw()
+
+    # Event loop: the scene is static, so block until an event arrives
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            break
+        if event.type == pygame.VIDEOEXPOSE:
+            # Window contents were lost: restore from the cached surfaces
+            draw()
+    pygame.quit()
+    sys.exit()
+
+
+def create_elevation_session(pool_size=8):
+    """
+    Create a requests Session for the Open-Elevation API
+    Connections are pooled across batches and rate limiting (HTTP 429) or
+    transient server errors are retried with backoff, honoring Retry-After
+    Args:
+        pool_size: Number of connections kept open (one per worker thread)
+    Returns:
+        requests.Session instance
+    """
+    retry = Retry(
+        total=8,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,  # Wait as long as the server asks
+        raise_on_status=False,  # Return the last response so errors are reported
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_elevation_open_elevation(
+    points, chunk_size=1000, max_workers=8, cache_file="elevation_cache"
+):
+    """
+    Fetch elevation data from Open-Elevation API for a list of coordinates
+    Args:
+        points: (N, 2) array of (lat, lon) rows (a list of tuples also works)
+        chunk_size: Number of points sent per API request
+        max_workers: Number of batch requests sent concurrently
+        cache_file: Persistent elevation cache (shelve) path, None to disable
+    Returns:
+        List of elevation values in meters
+    """
+    url = "https://api.open-elevation.com/api/v1/lookup"
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    # Cache keys are coordinates rounded to 6 decimals (~11cm)
+    keys = np.char.add(
+        np.char.add(np.char.mod("%.6f", coords[:, 0]), ","),
+        np.char.mod("%.6f", coords[:, 1]),
+    ).tolist()
+
+    with shelve.open(cache_file) if cache_file else nullcontext({}) as cache:
+        elevations = [cache.get(key) for key in keys]
+        # Only points missing from the cache are requested from the API
+        missing = [i for i, elev in enumerate(elevations) if elev is None]
+        # Per-point dicts are only built at the API boundary
+        locations = [
+            {"latitude": lat, "longitude": lon}
+            for lat, lon in coords[missing].tolist()
+        ]
+        chunks = [
+            locations[i : i + chunk_size]
+            for i in range(0, len(locations), chunk_size)
+        ]
+        if not chunks:
+            return elevations
+        workers = min(max_workers, len(chunks))
+
+        with create_elevation_session(workers) as session:
+
+            def fetch_chunk(chunk):
+                resp = session.post(url, json={"locations": chunk}, timeout=30)
+                if resp.status_code == 200:
+                    data = resp.json()
+                    return [r["elevation"] for r in data["results"]]
+                print("API error", resp.status_code, resp.text)
+                return [None] * len(chunk)
+
+            # Batches are sent in parallel; map() keeps results in request order
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(fetch_chunk, chunks))
+
+        fetched = [elev for chunk_elevations in results for elev in chunk_elevations]
+        for i, elev in zip(missing, fetched):
+            elevations[i] = elev
+            if elev is not None:
+                cache[keys[i]] = elev
+
+    return elevations
+
+
+def generate_line_points(lat1, lon1, lat2, lon2, n):
+    """
+    Generate n equally spaced points along a line from point A to point B
+    Args:
+        lat1, lon1: Starting point coordinates
+        lat2, lon2: Ending point coordinates
+        n: Number of points to generate
+    Returns:
+        (n, 2) array of (lat, lon) rows
+    """
+    t = np.linspace(0.0, 1.0, n)
+    lats = lat1 + (lat2 - lat1) * t
+    lons = lon1 + (lon2 - lon1) * t
+    return np.column_stack([lats, lons])
+
+
+def generate_cross_section_points(
+    center_lat, center_lon, move_bearing_deg, length_km, n
+):
+    """
+    Generate coordinates for a cross-section perpendicular to the movement direction
+    Args:
+        center_lat, center_lon: Center point of the cross-section
+        move_bearing_deg: Direction of movement (degrees from north)
+        length_km: Length of the cross-section (km)
+        n: Number of points to generate along the cross-section
+    Returns:
+        (n, 2) array of (lat, lon) rows representing the cross-section
+    """
+    half = length_km / 2
+
+    # Calculate left and right endpoints as seen from the movement direction
+    (left_lat, right_lat), (left_lon, right_lon) = dest_point(
+        center_lat,
+        center_lon,
+        np.array([move_bearing_deg - 90, move_bearing_deg + 90]),
+        half,
+    )
+
+    return generate_line_points(left_lat, left_lon, right_lat, right_lon, n)
+
+
+@njit(cache=True, fastmath=True)
+def _dest_point(lat, lon, bearing_deg, dist_km):
+    """
+    Spherical destination-point kernel (JIT-compiled when Numba is available)
+    Works element-wise on scalars or equally shaped arrays
+    """
+    lat1 = np.radians(lat)
+    lon1 = np.radians(lon)
+    bearing = np.radians(bearing_deg)
+    d_div_r = dist_km / EARTH_RADIUS_KM
+    lat2 = np.arcsin(
+        np.sin(lat1) * np.cos(d_div_r)
+        + np.cos(lat1) * np.sin(d_div_r) * np.cos(bearing)
+    )
+    lon2 = lon1 + np.arctan2(
+        np.sin(bearing) * np.sin(d_div_r) * np.cos(lat1),
+        np.cos(d_div_r) - np.sin(lat1) * np.sin(lat2),
+    )
+    return np.degrees(lat2), np.degrees(lon2)
+
+
+@njit(cache=True, parallel=True)
+def _dest_points(lats, lons, bearings_deg, dists_km):
+    """
+    Batched destination-point kernel parallelized across points with prange
+    Args are 1-D float64 arrays of equal length
+    """
+    n = lats.shape[0]
+    out_lat = np.empty(n)
+    out_lon = np.empty(n)
+    for i in prange(n):
+        lat2, lon2 = _dest_point(lats[i], lons[i], bearings_deg[i], dists_km[i])
+        out_lat[i] = lat2
+        out_lon[i] = lon2
+    return out_lat, out_lon
+
+
+def dest_point(lat, lon, bearing_deg, dist_km):
+    """
+    Calculate destination point given distance and bearing from starting point
+    Accepts scalars or arrays (broadcast against each other) for all arguments
+    """
+    args = (lat, lon, bearing_deg, dist_km)
+    if all(np.ndim(v) == 0 for v in args):
+        return _dest_point(*(float(v) for v in args))
+
+    lat, lon, bearing_deg, dist_km = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in args)
+    )
+    if not NUMBA_AVAILABLE:
+        # Without Numba the kernel is already vectorized by NumPy
+        return _dest_point(lat, lon, bearing_deg, dist_km)
+    lat2, lon2 = _dest_points(
+        lat.ravel(), lon.ravel(), bearing_deg.ravel(), dist_km.ravel()
+    )
+    return lat2.reshape(lat.shape), lon2.reshape(lat.shape)
+
+
+def example_usage():
+    """
+    Example usage scenarios for elevation cross-section generation
+    """
+    # Example 1: Mt. Fuji cross-section facing north
+    print("Example 1: Mt. Fuji cross-section facing north")
+    base_lat, base_lon = 35.3606, 138.7274  # Mt. Fuji
+    cross_section_demo(
+        base_lat,
+        base_lon,
+        move_bearing=0,
+        move_distance=0,
+        length_km=20,
+        description="Mt. Fuji base - North facing",
+    )
+
+    # Example 2: 10km north of Mt. Fuji, cross-section facing east
+    print("\nExample 2: 10km north of Mt. Fuji, cross-section facing east")
+    cross_section_demo(
+        base_lat,
+        base_lon,
+        move_bearing=0,
+        move_distance=10,
+        length_km=15,
+        description="10km North of Mt. Fuji - East facing",
+    )
+
+    # Example 3: 5km northeast of Mt. Fuji, cross-section facing southeast
+    print("\nExample 3: 5km northeast of Mt. Fuji, cross-section facing southeast")
+    cross_section_demo(
+        base_lat,
+        base_lon,
+        move_bearing=45,
+        move_distance=5,
+        length_km=12,
+        description="5km NE of Mt. Fuji - SE facing",
+    )
+
+
+def cross_section_demo(
+    base_lat, base_lon, move_bearing, move_distance, length_km, description
+):
+    """
+    Demonstrate cross-section generation with given parameters
+    """
+    print(f"  Location: {description}")
+    print(f"  Base coordinates: ({base_lat:.4f}, {base_lon:.4f})")
+    print(f"  Movement: {move_distance}km at {move_bearing}° bearing")
+    print(f"  Cross-section: {length_km}km perpendicular to movement direction")
+
+    # Calculate center point
+    center_lat, center_lon = dest_point(base_lat, base_lon, move_bearing, move_distance)
+    print(f"  Center coordinates: ({center_lat:.4f}, {center_lon:.4f})")
+
+    # Generate cross-section points (sample for demonstration)
+    n_points = 21  # Fewer points for demo
+    points = generate_cross_section_points(
+        center_lat, center_lon, move_bearing, length_km, n_points
+    )
+
+    print(f"  Generated {len(points)} points along cross-section")
+    print(f"  Left endpoint: ({points[0][0]:.4f}, {points[0][1]:.4f})")
+    print(f"  Right endpoint: ({points[-1][0]:.4f}, {points[-1][1]:.4f})")
+
+
+def format_column(fmt, values, missing="N/A"):
+    """
+    Format a numeric column in one vectorized call
+    Args:
+        fmt: printf-style format (e.g. "%.1f")
+        values: Numeric values (None/NaN entries are written as `missing`)
+        missing: Text used for missing values
+    Returns:
+        Array of formatted strings
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(arr), missing, np.char.mod(fmt, arr))
+
+
+def write_csv_rows(filename, rows):
+    """
+    Write rows to a CSV file with a single write call
+    Rows are serialized into an in-memory buffer first
+    """
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        f.write(buf.getvalue())
+
+
+def save_elevation_csv(data, filename, length_km=None, points=None):
+    """
+    Save elevation data to CSV file
+    Args:
+        data: List of elevation values
+        filename: Output filename
+        length_km: Total distance in km (optional, for distance calculation)
+        points: (lat, lon) coordinates, list or (N, 2) array (optional)
+    """
+    n = len(data)
+    header = ["Index"]
+    columns = [np.arange(n).astype(str)]
+
+    if length_km:
+        header.append("Distance_km")
+        columns.append(format_column("%.3f", np.linspace(0.0, length_km, n)))
+
+    if points is not None:
+        header.extend(["Latitude", "Longitude"])
+        # Rows beyond the given points are left without coordinates
+        coords = np.full((n, 2), np.nan)
+        given = np.asarray(points, dtype=np.float64).reshape(-1, 2)[:n]
+        coords[: len(given)] = given
+        columns.append(format_column("%.6f", coords[:, 0], missing=""))
+        columns.append(format_column("%.6f", coords[:, 1], missing=""))
+
+    header.append("Elevation_m")
+    columns.append(format_column("%.1f", data))
+
+    write_csv_rows(filename, [header, *zip(*columns)])
+
+    print(f"Elevation data saved to: {filename}")
+
+
+def save_cross_section_summary(
+    base_lat,
+    base_lon,
+    move_bearing_deg,
+    move_distance_km,
+    length_km,
+    center_lat,
+    center_lon,
+    points,
+    filename,
+):
+    """
+    Save cross-section parameters and coordinates to CSV file
+    Args:
+        base_lat, base_lon: Base coordinates
+        move_bearing_deg: Movement direction
+        move_distance_km: Movement distance
+        length_km: Cross-section length
+        center_lat, center_lon: Center coordinates
+        points: (N, 2) array of cross-section (lat, lon) coordinates
+        filename: Output filename
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(coords)
+    distances = np.linspace(0.0, length_km, n)  # Distance from left endpoint
+
+    rows = [
+        # Metadata
+        ["# Cross-Section Parameters"],
+        ["Base_Latitude", base_lat],
+        ["Base_Longitude", base_lon],
+        ["Movement_Bearing_deg", move_bearing_deg],
+        ["Movement_Distance_km", move_distance_km],
+        ["Cross_Section_Length_km", length_km],
+        ["Center_Latitude", center_lat],
+        ["Center_Longitude", center_lon],
+        [],  # Empty row
+        # Coordinates
+        ["# Cross-Section Coordinates"],
+        ["Index", "Distance_from_left_km", "Latitude", "Longitude"],
+    ]
+    rows.extend(
+        zip(
+            np.arange(n).astype(str),
+            format_column("%.3f", distances),
+            format_column("%.6f", coords[:, 0]),
+            format_column("%.6f", coords[:, 1]),
+        )
+    )
+    write_csv_rows(filename, rows)
+
+    print(f"Cross-section summary saved to: {filename}")
+
+
+def save_elevation_profile_image(data, length_km, filename, stats=None):
+    """
+    Save elevation profile as image file (PNG) with a JSON data sidecar
+    The PNG is rendered with matplotlib's Agg backend when it is installed
+    Args:
+        data: List of elevation values
+        length_km: Total distance in km
+        filename: Output filename (should end with .png)
+        stats: Precomputed compute_elevation_stats() result (optional)
+    """
+    import json
+
+    if stats is None:
+        stats = compute_elevation_stats(data)
+    profile_data = {
+        "length_km": length_km,
+        "elevations": list(data),
+        "points_count": stats["n"],
+        "max_elevation": stats["max"] if stats["n"] else 0,
+        "min_elevation": stats["min"] if stats["n"] else 0,
+    }
+
+    # Save the profile data as JSON for machine consumers
+    json_filename = filename.replace(".png", ".json")
+    with open(json_filename, "w", encoding="utf-8") as f:
+        json.dump(profile_data, f, indent=2)
+
+    print(f"Elevation profile data saved to: {json_filename}")
+
+    try:
+        from matplotlib.figure import Figure
+    except ImportError:
+        print("Note: Install matplotlib for actual PNG output")
+        return
+
+    # Same 1:1 scale as the pygame display (1280px wide at 100dpi)
+    layout = compute_display_layout(data, length_km, stats=stats)
+    fig = Figure(figsize=(layout["width"] / 100, max(2.0, layout["height"] / 100)))
+    ax = fig.subplots()
+    ax.plot(layout["dist_km"], np.asarray(data, dtype=np.float64), color="#3c783c")
+    ax.set_xlim(0, length_km)
+    ax.set_ylim(bottom=0)
+    ax.set_xlabel("Distance (km)")
+    ax.set_ylabel("Elevation (m)")
+    fig.savefig(filename, dpi=100)
+
+    print(f"Elevation profile image saved to: {filename}")
+
+
+def save_display_coordinates_csv(data, length_km, filename, stats=None):
+    """
+    Save pygame display coordinates to CSV file
+    Args:
+        data: List of elevation values
+        length_km: Total distance in km
+        filename: Output filename
+        stats: Precomputed compute_elevation_stats() result (optional)
+    """
+    # Display coordinates (same layout as in show_elevation_profile)
+    layout = compute_display_layout(data, length_km, stats=stats)
+    rows = [
+        # Display parameters
+        ["# Display Parameters"],
+        ["Screen_Width", layout["width"]],
+        ["Screen_Height", layout["height"]],
+        ["Margin", layout["margin"]],
+        ["Scale_pixels_per_km", f"{layout['scale']:.3f}"],
+        ["Max_Elevation_m", layout["max_elev"]],
+        ["Min_Elevation_m", layout["min_elev"]],
+        [],  # Empty row
+        # Coordinate headers
+        ["# Display Coordinates"],
+        ["Index", "Distance_km", "Elevation_m", "Screen_X", "Screen_Y"],
+    ]
+    rows.extend(
+        zip(
+            np.arange(len(layout["dist_km"])).astype(str),
+            format_column("%.3f", layout["dist_km"]),
+            format_column("%.1f", data),
+            format_column("%.1f", layout["screen_x"]),
+            format_column("%.1f", layout["screen_y"]),
+        )
+    )
+    write_csv_rows(filename, rows)
+
+    print(f"Display coordinates saved to: {filename}")
+
+
+if __name__ == "__main__":
+    print("topograph.py: Elevation cross-section generation test")
+
+    # Uncomment the line below to see usage examples
+    # example_usage()
+
+    try:
+        # Clean up existing cross-section files before generating new ones
+        import glob
+        import os
+
+        patterns = [
+            "cross_section_*km_elevation.csv",
+            "cross_section_*km_coordinates.csv",
+            "cross_section_*km_profile.json",
+            "cross_section_*km_profile.png",
+            "cross_section_*km_display_coords.csv",
+        ]
+        for pattern in patterns:
+            existing_files = glob.glob(pattern)
+            for file in existing_files:
+                os.remove(file)
+                print(f"Removed existing file: {file}")
+
+        # Base point and parameters - MODIFY THESE VALUES AS NEEDED
+        # base_lat, base_lon = 35.3606, 138.7274  # Mt. Fuji coordinates
+        # base_lat, base_lon = 35.6762, 138.2371  # South Alps (Kitadake area)
+        base_lat, base_lon = LOCATION_FUJI
+        move_bearing_deg = (
+            -90  # Movement direction (degrees from north): 0=N, 90=E, 180=S, 270=W
+        )
+        length_km = 20  # Cross-section length (km) perpendicular to movement direction
+        n_points = int(length_km * 1000 / 200) + 1  # ~200m spacing between points
+
+        # Multiple distances to generate (negative values move in opposite direction)
+        distances = [-20, -10, 0]  # km
+        save_to_files = True
+
+        for move_distance_km in distances:
+            print(f"\n=== Processing distance: {move_distance_km}km ===")
+
+            # Calculate center point after movement
+            center_lat, center_lon = dest_point(
+                base_lat, base_lon, move_bearing_deg, move_distance_km
+            )
+
+            # Generate cross-section coordinate list
+            points = generate_cross_section_points(
+                center_lat, center_lon, move_bearing_deg, length_km, n_points
+            )
+
+            # File prefix with distance
+            output_prefix = f"cross_section_{move_distance_km}km"
+
+            # Save cross-section summary if enabled
+            if save_to_files:
+                save_cross_section_summary(
+                    base_lat,
+                    base_lon,
+                    move_bearing_deg,
+                    move_distance_km,
+                    length_km,
+                    center_lat,
+                    center_lon,
+                    points,
+                    f"{output_prefix}_coordinates.csv",
+                )
+
+            # Fetch elevation data
+            print(f"Fetching elevation data for {len(points)} points...")
+            elevation_data = fetch_elevation_open_elevation(points)
+            if not elevation_data or any(e is None for e in elevation_data):
+                raise Exception("Failed to fetch elevation data")
+
+            # Save elevation data if enabled
+            if save_to_files:
+                stats = compute_elevation_stats(elevation_data)
+                save_elevation_csv(
+                    elevation_data,
+                    f"{output_prefix}_elevation.csv",
+                    length_km=length_km,
+                    points=points,
+                )
+                save_elevation_profile_image(
+                    elevation_data,
+                    length_km,
+                    f"{output_prefix}_profile.png",
+                    stats=stats,
+                )
+                save_display_coordinates_csv(
+                    elevation_data,
+                    length_km,
+                    f"{output_prefix}_display_coords.csv",
+                    stats=stats,
+                )
+
+        print("\n=== All distances processed! ===")
+        print("Files generated for distances:", distances)
+    except requests.exceptions.RequestException as e:
+        print(f"Network error while fetching elevation data: {e}")
+        print("Using dummy data for display")
+        dummy_data = [
+            100,
+            120,
+            130,
+            140,
+            160,
+            180,
+            170,
+            150,
+            140,
+            130,
+            120,
+            110,
+            100,
+            90,
+            80,
+            85,
+            90,
+            100,
+            120,
+            140,
+        ]
+
+        # Save dummy data if file output is enabled
+        output_prefix = "cross_section_dummy"
+        stats = compute_elevation_stats(dummy_data)
+        save_elevation_csv(dummy_data, f"{output_prefix}_elevation.csv", length_km=20)
+        save_elevation_profile_image(
+            dummy_data, 20, f"{output_prefix}_profile.png", stats=stats
+        )
+        save_display_coordinates_csv(
+            dummy_data, 20, f"{output_prefix}_display_coords.csv", stats=stats
+        )
+
+        show_elevation_profile(dummy_data, length_km=20)
+    except Exception as e:
+        print(f"Error occurred: {e}")
+        print("Using dummy data for display")
+        dummy_data = [
+            100,
+            120,
+            130,
+            140,
+            160,
+            180,
+            170,
+            150,
+            140,
+            130,
+            120,
+            110,
+            100,
+            90,
+            80,
+            85,
+            90,
+            100,
+            120,
+            140,
+        ]
+
+        # Save dummy data if file output is enabled
+        output_prefix = "cross_section_dummy"
+        stats = compute_elevation_stats(dummy_data)
+        save_elevation_csv(dummy_data, f"{output_prefix}_elevation.csv", length_km=20)
+        save_elevation_profile_image(
+            dummy_data, 20, f"{output_prefix}_profile.png", stats=stats
+        )
+        save_display_coordinates_csv(
+            dummy_data, 20, f"{output_prefix}_display_coords.csv", stats=stats
+        )
+
+        show_elevation_profile(dummy_data, length_km=20)
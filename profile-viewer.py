@@ -1,295 +1,479 @@
-# topodisp.py - 複数CSVファイルを重ね表示（1:1スケール＋移動平均）
-import pygame
-import csv
-import glob
-
-
-# 複数CSVから標高データ読み込み
-def load_multiple_csv():
-    files = glob.glob("cross_section_*km_elevation.csv")
-    if not files:
-        print("No CSV files found matching pattern: cross_section_*km_elevation.csv")
-        return []
-
-    datasets = []
-    for file in sorted(files):
-        data = []
-        length_km = 0  # Will be updated from CSV data
-        distance = file.split("_")[2].replace(
-            "km", ""
-        )  # Extract distance from filename
-
-        with open(file, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            for row in reader:
-                data.append(float(row[4]))  # Elevation column
-                length_km = max(length_km, float(row[1]))  # Update distance
-
-        datasets.append(
-            {
-                "data": data,
-                "length_km": length_km,
-                "distance": distance,
-                "filename": file,
-            }
-        )
-        print(f"Loaded {file}: {len(data)} points, {distance}km distance")
-
-    return datasets
-
-
-# 移動平均適用
-def smooth(data, window=3):
-    smoothed = []
-    half = window // 2
-    for i in range(len(data)):
-        left = max(0, i - half)
-        right = min(len(data), i + half + 1)
-        smoothed.append(sum(data[left:right]) / (right - left))
-    return smoothed
-
-
-# 複数データセットを表示
-datasets = load_multiple_csv()
-if not datasets:
-    exit()
-
-# Display mode selection
-fill_mode = True  # True: filled polygons, False: line drawing only
-print(f"Display mode: {'Filled' if fill_mode else 'Line'} drawing")
-print("Press 'F' to toggle between filled and line mode, 'ESC' to quit")
-
-# Apply smoothing to all datasets
-for dataset in datasets:
-    dataset["data"] = smooth(dataset["data"])
-
-# Calculate display parameters
-max_elev = max(max(d["data"]) for d in datasets)
-length_km = datasets[0]["length_km"]  # Assume all same length
-margin = 40
-WIDTH = 1280
-inner_width = WIDTH - 2 * margin
-scale = inner_width / length_km
-plot_height = int((max_elev / 1000) * scale)
-HEIGHT = plot_height + 2 * margin
-
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-
-# Color palette for different lines
-colors = [
-    (255, 0, 0),  # Red
-    (0, 255, 0),  # Green
-    (0, 0, 255),  # Blue
-    (255, 255, 0),  # Yellow
-    (255, 0, 255),  # Magenta
-    (0, 255, 255),  # Cyan
-    (255, 128, 0),  # Orange
-    (128, 0, 255),  # Purple
-    (0, 128, 255),  # Light Blue
-    (255, 128, 128),  # Pink
-]
-
-
-def update_display():
-    """Display drawing function"""
-    # Clear screen
-    screen.fill((240, 240, 255))
-
-    # Draw grid and axes
-    grid_color = (200, 200, 200)
-    axis_color = (100, 100, 100)
-    text_color = (50, 50, 50)
-
-    # Draw vertical grid lines (distance)
-    for km in range(0, int(length_km) + 1, 5):  # Every 5km
-        x = margin + km * scale
-        if 0 <= x <= WIDTH - margin:
-            pygame.draw.line(screen, grid_color, (x, margin), (x, HEIGHT - margin), 1)
-            # Distance labels
-            if km % 10 == 0:  # Label every 10km
-                label = "0km" if km == 0 else str(km)
-                text = font.render(label, True, text_color)
-                screen.blit(text, (x - 15, HEIGHT - margin + 5))
-
-    # Draw horizontal grid lines (elevation in km)
-    for elev_m in range(0, int(max_elev) + 1, 500):  # Every 500m
-        y = HEIGHT - margin - (elev_m / 1000) * scale
-        if margin <= y <= HEIGHT - margin:
-            pygame.draw.line(screen, grid_color, (margin, y), (WIDTH - margin, y), 1)
-            # Elevation labels in km
-            if elev_m % 1000 == 0:  # Label every 1000m = 1km
-                elev_km = elev_m // 1000
-                label = "0km" if elev_km == 0 else str(elev_km)
-                text = font.render(label, True, text_color)
-                screen.blit(text, (5, y - 8))
-
-    # Draw axes
-    pygame.draw.line(
-        screen, axis_color, (margin, margin), (margin, HEIGHT - margin), 2
-    )  # Y-axis
-    pygame.draw.line(
-        screen,
-        axis_color,
-        (margin, HEIGHT - margin),
-        (WIDTH - margin, HEIGHT - margin),
-        2,
-    )  # X-axis
-
-    # Draw all datasets (sorted by distance, farthest first for proper depth)
-    sorted_datasets_for_drawing = sorted(
-        datasets, key=lambda d: float(d["distance"]), reverse=True
-    )
-
-    for dataset in sorted_datasets_for_drawing:
-        data = dataset["data"]
-        # Find original color index to maintain consistent coloring
-        original_index = datasets.index(dataset)
-        color = colors[original_index % len(colors)]
-
-        # Calculate coordinates for the profile line
-        points = []
-        for j, elev in enumerate(data):
-            dist_km = length_km * j / (len(data) - 1)
-            x = margin + dist_km * scale
-            y = HEIGHT - margin - (elev / 1000) * scale
-            points.append((x, y))
-
-        # Create filled polygon by adding bottom edge points
-        if len(points) > 1:
-            if fill_mode:
-                # Add bottom-left and bottom-right points to close the polygon
-                filled_points = points[:]
-                filled_points.append((points[-1][0], HEIGHT - margin))  # Bottom-right
-                filled_points.append((points[0][0], HEIGHT - margin))  # Bottom-left
-
-                # Fill the area with semi-transparent color
-                fill_color = (*color, 128)  # Add alpha for transparency
-                # Create a surface for transparency
-                temp_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                pygame.draw.polygon(temp_surface, fill_color, filled_points)
-                screen.blit(temp_surface, (0, 0))
-
-            # Draw the outline (always drawn in both modes)
-            pygame.draw.aalines(screen, color, False, points, 2)
-
-    # Draw legend (sorted by distance, farthest first, right-aligned)
-    # Sort datasets by distance (descending order for farthest first)
-    sorted_datasets = sorted(datasets, key=lambda d: float(d["distance"]), reverse=True)
-
-    for i, dataset in enumerate(sorted_datasets):
-        # Find original color index
-        original_index = datasets.index(dataset)
-        color = colors[original_index % len(colors)]
-
-        y_pos = 10 + i * 20
-        # Draw colored line first (behind text)
-        distance_str = dataset["distance"]  # Keep original string including minus sign
-        text = font.render(f"{distance_str}km", True, (0, 0, 0))
-        # Right-align text so 'km' aligns in a column
-        text_x = WIDTH - text.get_width() - 5
-        pygame.draw.line(
-            screen,
-            color,
-            (text_x, y_pos + 8),
-            (text_x + text.get_width(), y_pos + 8),
-            3,
-        )
-        # Draw text on top
-        screen.blit(text, (text_x, y_pos))
-
-    # Draw checkbox UI in top-left corner
-    draw_checkbox()
-
-    pygame.display.flip()
-
-
-def draw_checkbox():
-    """Draw fill mode checkbox in top-left corner"""
-    checkbox_x = 10
-    checkbox_y = 10
-    checkbox_size = 16
-
-    # Draw checkbox square
-    checkbox_rect = pygame.Rect(checkbox_x, checkbox_y, checkbox_size, checkbox_size)
-    pygame.draw.rect(screen, (255, 255, 255), checkbox_rect)  # White background
-    pygame.draw.rect(screen, (0, 0, 0), checkbox_rect, 2)  # Black border
-
-    # Draw checkmark if fill_mode is True
-    if fill_mode:
-        # Draw checkmark (✓)
-        check_points = [
-            (checkbox_x + 3, checkbox_y + 8),
-            (checkbox_x + 7, checkbox_y + 12),
-            (checkbox_x + 13, checkbox_y + 4),
-        ]
-        pygame.draw.lines(screen, (0, 0, 0), False, check_points, 3)
-
-    # Draw label text
-    label_text = font.render("Fill", True, (0, 0, 0))
-    screen.blit(label_text, (checkbox_x + checkbox_size + 5, checkbox_y))
-
-    return checkbox_rect  # Return rect for click detection
-
-
-def is_point_in_checkbox(pos):
-    """Check if mouse position is within checkbox area"""
-    checkbox_x = 10
-    checkbox_y = 10
-    checkbox_size = 16
-    label_width = 30  # Approximate width of "Fill" text
-
-    # Expand clickable area to include label
-    click_rect = pygame.Rect(
-        checkbox_x, checkbox_y, checkbox_size + label_width, checkbox_size
-    )
-    return click_rect.collidepoint(pos)
-
-
-# Update window caption
-def update_caption():
-    caption = f"Multiple Cross-sections ({len(datasets)} files) - {'Filled' if fill_mode else 'Line'} Mode"
-    pygame.display.set_caption(caption)
-
-
-update_caption()
-
-# Initialize font for labels
-font = pygame.font.SysFont(None, 16)
-
-# Initial display
-update_display()
-
-# Event loop with real-time toggle
-clock = pygame.time.Clock()
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_f:
-                # Toggle fill mode with F key
-                fill_mode = not fill_mode
-                print(f"Switched to: {'Filled' if fill_mode else 'Line'} mode")
-                update_caption()
-                update_display()
-            elif event.key == pygame.K_ESCAPE:
-                running = False
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:  # Left mouse button
-                mouse_pos = pygame.mouse.get_pos()
-                if is_point_in_checkbox(mouse_pos):
-                    # Toggle fill mode with mouse click
-                    fill_mode = not fill_mode
-                    print(
-                        f"Clicked: Switched to {'Filled' if fill_mode else 'Line'} mode"
-                    )
-                    update_caption()
-                    update_display()
-
-    clock.tick(30)
-
-pygame.quit()
-exit()
+# topodisp.py - 複数CSVファイルを重ね表示（1:1スケール＋移動平均）
+import pygame
+import glob
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional: CSVs are parsed with numpy.loadtxt
+    pd = None
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional: smooth() uses NumPy prefix sums
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Distance_km・Elevation_m列を読み込み（pandasがあればpyarrow/Cパーサを使用）
+def read_columns(file):
+    # float32: half the memory and bandwidth of float64
+    if pd is not None:
+        # The pyarrow engine only accepts column names in usecols
+        columns = ["Distance_km", "Elevation_m"]
+        try:
+            df = pd.read_csv(file, usecols=columns, dtype=np.float32, engine="pyarrow")
+        except ImportError:  # pyarrow is not installed
+            df = pd.read_csv(file, usecols=columns, dtype=np.float32, engine="c")
+        return df[columns].to_numpy()
+
+    # Parse the columns in C, skipping the header
+    return np.loadtxt(
+        file,
+        delimiter=",",
+        skiprows=1,
+        usecols=(1, 4),
+        dtype=np.float32,
+        encoding="utf-8",
+        ndmin=2,
+    )
+
+
+# 1ファイル分の標高データ読み込み
+def load_csv(file):
+    distance = file.split("_")[2].replace("km", "")  # Extract distance from filename
+
+    arr = read_columns(file)
+    data = arr[:, 1]  # Elevation column
+    length_km = float(arr[:, 0].max()) if len(arr) else 0
+
+    return {
+        "data": data,
+        "length_km": length_km,
+        "distance": distance,
+        "distance_val": float(distance),
+        "filename": file,
+    }
+
+
+# 複数CSVから標高データ読み込み
+def load_multiple_csv():
+    files = glob.glob("cross_section_*km_elevation.csv")
+    if not files:
+        print("No CSV files found matching pattern: cross_section_*km_elevation.csv")
+        return []
+
+    # Files are independent: read them concurrently, map() keeps sorted order
+    with ThreadPoolExecutor(max_workers=min(len(files), 8)) as executor:
+        datasets = list(executor.map(load_csv, sorted(files)))
+
+    for dataset in datasets:
+        print(
+            f"Loaded {dataset['filename']}: {len(dataset['data'])} points, "
+            f"{dataset['distance']}km distance"
+        )
+
+    return datasets
+
+
+# 移動平均（Numba並列カーネル、端は窓を切り詰め）
+@njit(cache=True, parallel=True)
+def smooth_nb(a, window):
+    n = a.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    half = window // 2
+    for i in prange(n):
+        left = max(0, i - half)
+        right = min(n, i + half + 1)
+        total = 0.0
+        for k in range(left, right):
+            total += a[k]
+        out[i] = total / (right - left)
+    return out
+
+
+# 移動平均適用
+def smooth(data, window=3):
+    a = np.asarray(data, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        return smooth_nb(a, window)
+    # Prefix sums give each truncated window mean in O(1): O(N) overall.
+    # Accumulate in float64 to avoid precision loss, store as float32
+    n = len(a)
+    half = window // 2
+    c = np.concatenate(([0.0], np.cumsum(a, dtype=np.float64)))
+    i = np.arange(n)
+    left = np.maximum(0, i - half)
+    right = np.minimum(n, i + half + 1)
+    return ((c[right] - c[left]) / (right - left)).astype(np.float32)
+
+
+# 画面座標をpygame描画用のint16配列に変換（ピクセル数を超える頂点は間引き）
+def to_screen_points(xs, ys, max_points=None):
+    n = len(xs)
+    pts = np.empty((n, 2), dtype=np.int16)
+    pts[:, 0] = np.clip(xs, -32000, 32000)
+    pts[:, 1] = np.clip(ys, -32000, 32000)
+    if max_points and n > max_points:
+        # Keep every stride-th point plus the last one
+        stride = -(-n // max_points)
+        idx = np.arange(0, n, stride)
+        if idx[-1] != n - 1:
+            idx = np.append(idx, n - 1)
+        pts = pts[idx]
+    return pts
+
+
+# 高密度データを列ごとの最小・最大の帯ポリゴンに縮約
+def to_envelope_polygon(xs, ys, cols):
+    starts = np.linspace(0, len(xs), cols, endpoint=False).astype(np.intp)
+    x = xs[starts]
+    upper = to_screen_points(x, np.minimum.reduceat(ys, starts))
+    lower = to_screen_points(x, np.maximum.reduceat(ys, starts))
+    # Upper edge left to right, then lower edge right to left
+    return np.concatenate([upper, lower[::-1]])
+
+
+# 複数データセットを表示
+datasets = load_multiple_csv()
+if not datasets:
+    exit()
+
+# Display mode selection
+fill_mode = True  # True: filled polygons, False: line drawing only
+print(f"Display mode: {'Filled' if fill_mode else 'Line'} drawing")
+fast_mode = False  # True: plain (non-antialiased) outlines, faster on long profiles
+print("Press 'F' to toggle between filled and line mode, 'ESC' to quit")
+print("Press 'A' to toggle antialiased outlines")
+
+# Apply smoothing to all datasets
+for dataset in datasets:
+    dataset["data"] = smooth(dataset["data"])
+
+# Calculate display parameters
+max_elev = max(float(d["data"].max()) for d in datasets)
+length_km = datasets[0]["length_km"]  # Assume all same length
+margin = 40
+WIDTH = 1280
+inner_width = WIDTH - 2 * margin
+scale = inner_width / length_km
+plot_height = int((max_elev / 1000) * scale)
+HEIGHT = plot_height + 2 * margin
+
+
+# 各データセットの画面座標を事前計算（画面サイズが変わった時のみ再計算）
+def build_points():
+    # x depends only on the point count, shared by datasets of equal length
+    xs_by_count = {}
+    for dataset in datasets:
+        data = dataset["data"]
+        n = len(data)
+        if n not in xs_by_count:
+            xs_by_count[n] = margin + np.linspace(0.0, length_km, n) * scale
+        xs = xs_by_count[n]
+        ys = HEIGHT - margin - (data / 1000) * scale
+        if n > 2 * inner_width:
+            # Dense profile: per-column min/max band, its upper edge bounds the fill
+            dataset["band"] = to_envelope_polygon(xs, ys, inner_width)
+            dataset["points"] = dataset["band"][:inner_width]
+        else:
+            dataset["band"] = None
+            dataset["points"] = to_screen_points(xs, ys, max_points=inner_width)
+
+        # Filled polygon: profile plus bottom-right and bottom-left corners
+        points = dataset["points"]
+        poly = np.empty((len(points) + 2, 2), dtype=points.dtype)
+        poly[:-2] = points
+        poly[-2] = (points[-1, 0], HEIGHT - margin)  # Bottom-right
+        poly[-1] = (points[0, 0], HEIGHT - margin)  # Bottom-left
+        dataset["fill_poly"] = poly
+        # Plain int pairs for the outline draw calls, converted only once
+        dataset["points_list"] = points.tolist()
+        # Bounding box of everything drawn for the dataset (fill covers outline)
+        xmin, ymin = poly.min(axis=0)
+        xmax, ymax = poly.max(axis=0)
+        dataset["bbox"] = pygame.Rect(
+            int(xmin), int(ymin), int(xmax - xmin) + 1, int(ymax - ymin) + 1
+        )
+
+
+# Visible plot area: datasets entirely outside it are not drawn
+plot_rect = pygame.Rect(margin, margin, inner_width + 1, HEIGHT - 2 * margin + 1)
+build_points()
+
+pygame.init()
+screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# Transparent layer for filled areas, reused by every redraw
+overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA).convert_alpha()
+
+# Color palette for different lines
+colors = [
+    (255, 0, 0),  # Red
+    (0, 255, 0),  # Green
+    (0, 0, 255),  # Blue
+    (255, 255, 0),  # Yellow
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Cyan
+    (255, 128, 0),  # Orange
+    (128, 0, 255),  # Purple
+    (0, 128, 255),  # Light Blue
+    (255, 128, 128),  # Pink
+]
+
+# Assign each dataset its color once, by load order, for consistent coloring
+for i, dataset in enumerate(datasets):
+    dataset["color_idx"] = i
+    dataset["color"] = colors[i % len(colors)]
+
+# Draw and legend order: sorted by distance, farthest first (fixed after load)
+draw_order = sorted(datasets, key=lambda d: d["distance_val"], reverse=True)
+
+
+def update_display():
+    """Display drawing function"""
+    # Grid, axes and labels are pre-rendered by build_background()
+    screen.blit(background, (0, 0))
+
+    # Draw all datasets in draw_order (farthest first for proper depth)
+    # Fill mode: draw all filled areas into the shared overlay, blit it once
+    if fill_mode:
+        overlay.fill((0, 0, 0, 0))
+        for dataset in draw_order:
+            if len(dataset["points"]) > 1 and plot_rect.colliderect(dataset["bbox"]):
+                # Fill the area with semi-transparent color
+                fill_color = (*dataset["color"], 128)  # Add alpha for transparency
+                pygame.draw.polygon(overlay, fill_color, dataset["fill_poly"])
+        screen.blit(overlay, (0, 0))
+
+    for dataset in draw_order:
+        color = dataset["color"]
+
+        # Screen coordinates are precomputed by build_points()
+        points = dataset["points"]
+        band = dataset["band"]
+
+        # Draw the outline (always drawn in both modes)
+        if len(points) > 1 and plot_rect.colliderect(dataset["bbox"]):
+            if band is not None:
+                pygame.draw.polygon(screen, color, band)
+            elif fast_mode:
+                pygame.draw.lines(screen, color, False, dataset["points_list"], 2)
+            else:
+                pygame.draw.aalines(screen, color, False, dataset["points_list"], 2)
+
+    # Draw legend (draw_order: farthest first, right-aligned)
+    swatch_blits = []
+    label_blits = []
+    for i, dataset in enumerate(draw_order):
+        y_pos = 10 + i * 20
+        label = dataset["label_surf"]
+        # Right-align text so 'km' aligns in a column
+        text_x = WIDTH - label.get_width() - 5
+        swatch_blits.append((dataset["swatch_surf"], (text_x, y_pos + 7)))
+        label_blits.append((label, (text_x, y_pos)))
+    # Colored lines first (behind text), then text on top, in one batched call
+    blit_batch(swatch_blits + label_blits)
+
+    # Draw checkbox UI in top-left corner
+    draw_checkbox()
+
+    pygame.display.flip()
+
+
+def draw_checkbox():
+    """Draw fill mode checkbox in top-left corner"""
+    checkbox_x = 10
+    checkbox_y = 10
+    checkbox_size = 16
+
+    # Draw checkbox square
+    checkbox_rect = pygame.Rect(checkbox_x, checkbox_y, checkbox_size, checkbox_size)
+    pygame.draw.rect(screen, (255, 255, 255), checkbox_rect)  # White background
+    pygame.draw.rect(screen, (0, 0, 0), checkbox_rect, 2)  # Black border
+
+    # Draw checkmark if fill_mode is True
+    if fill_mode:
+        # Draw checkmark (✓)
+        check_points = [
+            (checkbox_x + 3, checkbox_y + 8),
+            (checkbox_x + 7, checkbox_y + 12),
+            (checkbox_x + 13, checkbox_y + 4),
+        ]
+        pygame.draw.lines(screen, (0, 0, 0), False, check_points, 3)
+
+    # Draw label text
+    label_text = render_text("Fill", (0, 0, 0))
+    screen.blit(label_text, (checkbox_x + checkbox_size + 5, checkbox_y))
+
+    return checkbox_rect  # Return rect for click detection
+
+
+def is_point_in_checkbox(pos):
+    """Check if mouse position is within checkbox area"""
+    checkbox_x = 10
+    checkbox_y = 10
+    checkbox_size = 16
+    label_width = 30  # Approximate width of "Fill" text
+
+    # Expand clickable area to include label
+    click_rect = pygame.Rect(
+        checkbox_x, checkbox_y, checkbox_size + label_width, checkbox_size
+    )
+    return click_rect.collidepoint(pos)
+
+
+# Update window caption
+def update_caption():
+    caption = f"Multiple Cross-sections ({len(datasets)} files) - {'Filled' if fill_mode else 'Line'} Mode"
+    pygame.display.set_caption(caption)
+
+
+update_caption()
+
+# Initialize font for labels
+font = pygame.font.SysFont(None, 16)
+
+
+# Labels repeat on every redraw: rasterize each (text, color) only once
+@lru_cache(maxsize=256)
+def render_text(text, color):
+    return font.render(text, True, color).convert_alpha()
+
+
+# Blit many surfaces in one call (fblits on pygame-ce, blits otherwise)
+def blit_batch(sequence, target=None):
+    target = screen if target is None else target
+    if hasattr(target, "fblits"):
+        target.fblits(sequence)
+    else:
+        target.blits(sequence, doreturn=False)
+
+
+# グリッド・軸・ラベルを背景サーフェスに事前描画（画面サイズが変わった時のみ再作成）
+def build_background():
+    background = pygame.Surface((WIDTH, HEIGHT)).convert()
+    background.fill((240, 240, 255))
+
+    # Draw grid and axes
+    grid_color = (200, 200, 200)
+    axis_color = (100, 100, 100)
+    text_color = (50, 50, 50)
+    label_blits = []  # Labels are blitted together after the grid loops
+
+    # Draw vertical grid lines (distance)
+    for km in range(0, int(length_km) + 1, 5):  # Every 5km
+        x = margin + km * scale
+        if 0 <= x <= WIDTH - margin:
+            pygame.draw.line(
+                background, grid_color, (x, margin), (x, HEIGHT - margin), 1
+            )
+            # Distance labels
+            if km % 10 == 0:  # Label every 10km
+                label = "0km" if km == 0 else str(km)
+                text = render_text(label, text_color)
+                label_blits.append((text, (x - 15, HEIGHT - margin + 5)))
+
+    # Draw horizontal grid lines (elevation in km)
+    for elev_m in range(0, int(max_elev) + 1, 500):  # Every 500m
+        y = HEIGHT - margin - (elev_m / 1000) * scale
+        if margin <= y <= HEIGHT - margin:
+            pygame.draw.line(
+                background, grid_color, (margin, y), (WIDTH - margin, y), 1
+            )
+            # Elevation labels in km
+            if elev_m % 1000 == 0:  # Label every 1000m = 1km
+                elev_km = elev_m // 1000
+                label = "0km" if elev_km == 0 else str(elev_km)
+                text = render_text(label, text_color)
+                label_blits.append((text, (5, y - 8)))
+
+    blit_batch(label_blits, background)
+
+    # Draw axes
+    pygame.draw.line(
+        background, axis_color, (margin, margin), (margin, HEIGHT - margin), 2
+    )  # Y-axis
+    pygame.draw.line(
+        background,
+        axis_color,
+        (margin, HEIGHT - margin),
+        (WIDTH - margin, HEIGHT - margin),
+        2,
+    )  # X-axis
+    return background
+
+
+background = build_background()
+
+
+# 凡例の色見本とラベルを事前作成
+def build_legend():
+    for dataset in datasets:
+        # Keep original distance string including minus sign
+        label = render_text(f"{dataset['distance']}km", (0, 0, 0))
+        swatch = pygame.Surface((label.get_width(), 3)).convert()
+        swatch.fill(dataset["color"])
+        dataset["label_surf"] = label
+        dataset["swatch_surf"] = swatch
+
+
+build_legend()
+
+# Initial display
+update_display()
+
+
+# イベント処理（再描画が必要な場合はTrueを返す）
+def handle_event(event):
+    global running, fill_mode, fast_mode
+    if event.type == pygame.QUIT:
+        running = False
+    elif event.type == pygame.KEYDOWN:
+        if event.key == pygame.K_f:
+            # Toggle fill mode with F key
+            fill_mode = not fill_mode
+            print(f"Switched to: {'Filled' if fill_mode else 'Line'} mode")
+            return True
+        elif event.key == pygame.K_a:
+            # Toggle antialiased outlines with A key
+            fast_mode = not fast_mode
+            print(f"Antialiasing: {'Off' if fast_mode else 'On'}")
+            return True
+        elif event.key == pygame.K_ESCAPE:
+            running = False
+    elif event.type == pygame.MOUSEBUTTONDOWN:
+        if event.button == 1:  # Left mouse button
+            mouse_pos = pygame.mouse.get_pos()
+            if is_point_in_checkbox(mouse_pos):
+                # Toggle fill mode with mouse click
+                fill_mode = not fill_mode
+                print(f"Clicked: Switched to {'Filled' if fill_mode else 'Line'} mode")
+                return True
+    return False
+
+
+# Event loop with real-time toggle: block until an event arrives, then drain
+# the queue and redraw at most once for the whole batch
+running = True
+while running:
+    redraw = handle_event(pygame.event.wait())
+    event = pygame.event.poll()
+    while event.type != pygame.NOEVENT:
+        redraw = handle_event(event) or redraw
+        event = pygame.event.poll()
+    if running and redraw:
+        update_caption()
+        update_display()
+
+pygame.quit()
+exit()